@@ -6,6 +6,7 @@
 
 __version__ = "2.28.0"
 
+import logging
 import os
 import sys
 import timeit
@@ -283,7 +284,8 @@ class MainCommandsLoader(CLICommandsLoader):
                     logger.error("Error loading command module '%s': %s", mod, ex)
                     telemetry.set_exception(exception=ex, fault_type='module-load-error-' + mod,
                                             summary='Error loading module: {}'.format(mod))
-                    logger.debug(traceback.format_exc())
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(traceback.format_exc())
             # Summary line
             logger.debug(self.item_format_string,
                          "Total ({})".format(count), cumulative_elapsed_time,
@@ -382,7 +384,8 @@ class MainCommandsLoader(CLICommandsLoader):
                         self.cli_ctx.raise_event(EVENT_FAILED_EXTENSION_LOAD, extension_name=ext_name)
                         logger.warning("Unable to load extension '%s: %s'. Use --debug for more information.",
                                        ext_name, ex)
-                        logger.debug(traceback.format_exc())
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(traceback.format_exc())
                 # Summary line
                 logger.debug(self.item_ext_format_string,
                              "Total ({})".format(count), cumulative_elapsed_time,
@@ -10,8 +10,17 @@ import os
 import os.path
 import re
 import string
+import sys
+import threading
+import time
 from copy import deepcopy
 from enum import Enum
+from functools import lru_cache
+
+try:
+    import orjson  # optional speedup for parsing/serializing large token files
+except ImportError:
+    orjson = None
 
 from knack.log import get_logger
 from knack.util import CLIError
@@ -75,6 +84,22 @@ _ASSIGNED_IDENTITY_INFO = 'assignedIdentityInfo'
 
 _AZ_LOGIN_MESSAGE = "Please run 'az login' to setup account."
 
+# Opt-in switch to keep service principal credentials in a sqlite database instead of
+# accessTokens.json. Not meant to be user documented until the rollout completes.
+_USE_SQLITE_SP_CREDS_ENV = 'AZURE_CLI_SP_CREDS_SQLITE'
+
+# Landing pages served after the browser-based login. Their contents never change, so resolve the
+# paths once at import time and cache the file contents on first use.
+_AUTH_LANDING_PAGES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'auth_landing_pages')
+_AUTH_OK_PAGE = os.path.join(_AUTH_LANDING_PAGES_DIR, 'ok.html')
+_AUTH_FAIL_PAGE = os.path.join(_AUTH_LANDING_PAGES_DIR, 'fail.html')
+
+
+@lru_cache(maxsize=None)
+def _read_landing_page(landing_file):
+    with open(landing_file, 'rb') as html_file:
+        return html_file.read()
+
 _USE_VENDORED_SUBSCRIPTION_SDK = False
 
 
@@ -96,25 +121,81 @@ def _get_authority_url(cli_ctx, tenant):
     return authority_url, is_adfs
 
 
+# Constructing an adal.AuthenticationContext is not free - it rebuilds the authority and, when no
+# cache is given, a fresh in-memory token cache. Memoize contexts per (authority, cache) so that
+# code paths creating contexts repeatedly in one process reuse them.
+_AUTH_CTX_CACHE = {}
+_AUTH_CTX_CACHE_LOCK = threading.Lock()
+
+
 def _authentication_context_factory(cli_ctx, tenant, cache):
     import adal
     authority_url, is_adfs = _get_authority_url(cli_ctx, tenant)
-    return adal.AuthenticationContext(authority_url, cache=cache, api_version=None, validate_authority=(not is_adfs))
+    # The cache object takes part in the key so each token cache keeps its own context. It also
+    # keeps the cache alive, which makes the key stable for the lifetime of the process.
+    key = (authority_url, not is_adfs, cache)
+    with _AUTH_CTX_CACHE_LOCK:
+        context = _AUTH_CTX_CACHE.get(key)
+        if context is None:
+            context = adal.AuthenticationContext(authority_url, cache=cache, api_version=None,
+                                                 validate_authority=(not is_adfs))
+            _AUTH_CTX_CACHE[key] = context
+    return context
 
 
 _AUTH_CTX_FACTORY = _authentication_context_factory
 
 
+# Parsed token files keyed by path. Each value is (mtime, entries). The token file can easily
+# be read several times in one process (e.g. multiple CredsCache instances), so reuse the parsed
+# result as long as the file hasn't been rewritten.
+_TOKEN_FILE_CACHE = {}
+
+
+def _read_token_file_entries(file_path):
+    if orjson is not None:
+        with open(file_path, 'rb') as token_file:
+            content = token_file.read()
+        if not content.strip():
+            return []
+        try:
+            return orjson.loads(content)
+        except ValueError:
+            # fall through for encodings orjson doesn't accept (e.g. BOM); truly corrupt
+            # content will fail the stdlib parse below as well
+            pass
+    return get_file_json(file_path, throw_on_empty=False) or []
+
+
+def _serialize_token_entries(all_creds):
+    if orjson is not None:
+        return orjson.dumps(all_creds).decode()
+    return json.dumps(all_creds, separators=(',', ':'))
+
+
 def _load_tokens_from_file(file_path):
-    if os.path.isfile(file_path):
+    try:
+        # one stat call serves as both the existence check and the cache validation, so the
+        # common "never logged in" path costs a single syscall
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        logger.debug("'%s' is not a file or doesn't exist.", file_path)
+        return []
+    cached = _TOKEN_FILE_CACHE.get(file_path)
+    if not (cached and cached[0] == mtime):
         try:
-            return get_file_json(file_path, throw_on_empty=False) or []
+            entries = _read_token_file_entries(file_path)
+        except OSError:  # the file went away after the stat, or isn't a regular file
+            logger.debug("'%s' is not a file or doesn't exist.", file_path)
+            return []
         except (CLIError, ValueError) as ex:
             raise CLIError("Failed to load token files. If you have a repro, please log an issue at "
                            "https://github.com/Azure/azure-cli/issues. At the same time, you can clean "
                            "up by running 'az account clear' and then 'az login'. (Inner Error: {})".format(ex))
-    logger.debug("'%s' is not a file or doesn't exist.", file_path)
-    return []
+        cached = (mtime, entries)
+        _TOKEN_FILE_CACHE[file_path] = cached
+    # callers mutate the entries, so hand out a copy and keep the cached ones pristine
+    return deepcopy(cached[1])
 
 
 def _delete_file(file_path):
@@ -152,20 +233,35 @@ class Profile:
         self._storage = storage or ACCOUNT
         self.auth_ctx_factory = auth_ctx_factory or _AUTH_CTX_FACTORY
 
-        if use_global_creds_cache:
-            # for perf, use global cache
-            if not Profile._global_creds_cache:
-                Profile._global_creds_cache = CredsCache(self.cli_ctx, self.auth_ctx_factory,
-                                                         async_persist=async_persist)
-            self._creds_cache = Profile._global_creds_cache
-        else:
-            self._creds_cache = CredsCache(self.cli_ctx, self.auth_ctx_factory, async_persist=async_persist)
+        # the creds cache is built lazily on first use, so Profiles created just to read
+        # account state (e.g. `account show`) never touch it
+        self._use_global_creds_cache = use_global_creds_cache
+        self._async_persist = async_persist
+        self._creds_cache_attr = None
 
         self._management_resource_uri = self.cli_ctx.cloud.endpoints.management
         self._ad_resource_uri = self.cli_ctx.cloud.endpoints.active_directory_resource_id
         self._ad = self.cli_ctx.cloud.endpoints.active_directory
         self._msi_creds = None
 
+    @property
+    def _creds_cache(self):
+        if self._creds_cache_attr is None:
+            if self._use_global_creds_cache:
+                # for perf, use global cache
+                if not Profile._global_creds_cache:
+                    Profile._global_creds_cache = CredsCache(self.cli_ctx, self.auth_ctx_factory,
+                                                             async_persist=self._async_persist)
+                self._creds_cache_attr = Profile._global_creds_cache
+            else:
+                self._creds_cache_attr = CredsCache(self.cli_ctx, self.auth_ctx_factory,
+                                                    async_persist=self._async_persist)
+        return self._creds_cache_attr
+
+    @_creds_cache.setter
+    def _creds_cache(self, value):
+        self._creds_cache_attr = value
+
     def find_subscriptions_on_login(self,
                                     interactive,
                                     username,
@@ -251,7 +347,6 @@ class Profile:
 
     def _normalize_properties(self, user, subscriptions, is_service_principal, cert_sn_issuer_auth=None,
                               user_assigned_identity_id=None):
-        import sys
         consolidated = []
         for s in subscriptions:
             display_name = s.display_name
@@ -596,8 +691,9 @@ class Profile:
                         external_tokens.append(self._creds_cache.retrieve_token_for_user(
                             username_or_sp_id, sub_tenant_id, token_resource))
                     else:
+                        use_cert_sn_issuer = account[_USER_ENTITY].get(_SERVICE_PRINCIPAL_CERT_SN_ISSUER_AUTH)
                         external_tokens.append(self._creds_cache.retrieve_token_for_service_principal(
-                            username_or_sp_id, token_resource, sub_tenant_id, token_resource))
+                            username_or_sp_id, token_resource, sub_tenant_id, use_cert_sn_issuer))
                 return external_tokens
 
             from azure.cli.core.adal_authentication import AdalAuthentication
@@ -773,11 +869,10 @@ class Profile:
         self._set_subscriptions(result, merge=False)
 
     def get_sp_auth_info(self, subscription_id=None, name=None, password=None, cert_file=None):
-        from collections import OrderedDict
         account = self.get_subscription(subscription_id)
 
         # is the credential created through command like 'create-for-rbac'?
-        result = OrderedDict()
+        result = collections.OrderedDict()
         if name and (password or cert_file):
             result['clientId'] = name
             if password:
@@ -802,7 +897,7 @@ class Profile:
                 raise CLIError('SDK Auth file is only applicable when authenticated using a service principal')
 
         result[_TENANT_ID] = account[_TENANT_ID]
-        endpoint_mappings = OrderedDict()  # use OrderedDict to control the output sequence
+        endpoint_mappings = collections.OrderedDict()  # use OrderedDict to control the output sequence
         endpoint_mappings['active_directory'] = 'activeDirectoryEndpointUrl'
         endpoint_mappings['resource_manager'] = 'resourceManagerEndpointUrl'
         endpoint_mappings['active_directory_graph_resource_id'] = 'activeDirectoryGraphResourceId'
@@ -894,6 +989,8 @@ class SubscriptionFinder:
 
         self._arm_client_factory = create_arm_client_factory
         self.tenants = []
+        # auth contexts built by this finder, keyed by (tenant, use_token_cache)
+        self._auth_contexts = {}
 
     def find_from_user_account(self, username, password, tenant, resource):
         context = self._create_auth_context(tenant)
@@ -959,8 +1056,13 @@ class SubscriptionFinder:
         return result
 
     def _create_auth_context(self, tenant, use_token_cache=True):
-        token_cache = self._adal_token_cache if use_token_cache else None
-        return self._auth_context_factory(self.cli_ctx, tenant, token_cache)
+        key = (tenant, use_token_cache)
+        context = self._auth_contexts.get(key)
+        if context is None:
+            token_cache = self._adal_token_cache if use_token_cache else None
+            context = self._auth_context_factory(self.cli_ctx, tenant, token_cache)
+            self._auth_contexts[key] = context
+        return context
 
     def _find_using_common_tenant(self, access_token, resource):
         import adal
@@ -1080,26 +1182,40 @@ class CredsCache:
         self._token_file = (os.environ.get('AZURE_ACCESS_TOKEN_FILE', None) or
                             os.path.join(get_config_dir(), 'accessTokens.json'))
         self._service_principal_creds = []
+        # index of _service_principal_creds keyed by (sp_id, tenant) for O(1) lookups
+        self._sp_creds_index = {}
         self._auth_ctx_factory = auth_ctx_factory
         self._adal_token_cache_attr = None
         self._should_flush_to_disk = False
         self._async_persist = async_persist
+        self._sp_sqlite_store_attr = None
         self._ctx = cli_ctx
         if async_persist:
             import atexit
             atexit.register(self.flush_to_disk)
 
+    @property
+    def _sp_sqlite_store(self):
+        if self._sp_sqlite_store_attr is None and os.environ.get(_USE_SQLITE_SP_CREDS_ENV):
+            self._sp_sqlite_store_attr = SqliteCredStore(os.path.join(get_config_dir(),
+                                                                      'servicePrincipalCreds.db'))
+        return self._sp_sqlite_store_attr
+
     def persist_cached_creds(self):
         self._should_flush_to_disk = True
         if not self._async_persist:
             self.flush_to_disk()
-        self.adal_token_cache.has_state_changed = False
+        # a pending change implies the cache was already loaded; don't go through the loader again
+        (self._adal_token_cache_attr or self.adal_token_cache).has_state_changed = False
 
     def flush_to_disk(self):
         if self._should_flush_to_disk:
-            with os.fdopen(os.open(self._token_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600),
+            # write to a sibling temp file then swap it in, so an interrupted write can't leave
+            # a truncated token file behind
+            temp_file = self._token_file + '.tmp'
+            with os.fdopen(os.open(temp_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600),
                            'w+') as cred_file:
-                items = self.adal_token_cache.read_items()
+                items = (self._adal_token_cache_attr or self.adal_token_cache).read_items()
                 all_creds = [entry for _, entry in items]
 
                 # trim away useless fields (needed for cred sharing with xplat)
@@ -1107,31 +1223,41 @@ class CredsCache:
                     for key in TOKEN_FIELDS_EXCLUDED_FROM_PERSISTENCE:
                         i.pop(key, None)
 
-                all_creds.extend(self._service_principal_creds)
-                cred_file.write(json.dumps(all_creds))
+                if self._sp_sqlite_store is None:
+                    all_creds.extend(self._service_principal_creds)
+                cred_file.write(_serialize_token_entries(all_creds))
+            os.replace(temp_file, self._token_file)
+            # everything is on disk now; don't rewrite the file again (e.g. at exit) unless
+            # another change comes in
+            self._should_flush_to_disk = False
+            # we know what we just wrote, so refresh the parse cache instead of re-reading
+            try:
+                _TOKEN_FILE_CACHE[self._token_file] = (os.path.getmtime(self._token_file), deepcopy(all_creds))
+            except OSError:
+                _TOKEN_FILE_CACHE.pop(self._token_file, None)
 
     def retrieve_token_for_user(self, username, tenant, resource):
-        context = self._auth_ctx_factory(self._ctx, tenant, cache=self.adal_token_cache)
+        adal_token_cache = self.adal_token_cache
+        context = self._auth_ctx_factory(self._ctx, tenant, cache=adal_token_cache)
         token_entry = context.acquire_token(resource, username, _CLIENT_ID)
         if not token_entry:
             raise CLIError("Could not retrieve token from local cache.{}".format(
                 " Please run 'az login'." if not in_cloud_console() else ''))
 
-        if self.adal_token_cache.has_state_changed:
+        if adal_token_cache.has_state_changed:
             self.persist_cached_creds()
         return (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
 
     def retrieve_token_for_service_principal(self, sp_id, resource, tenant, use_cert_sn_issuer=False):
         self.load_adal_token_cache()
-        matched = [x for x in self._service_principal_creds if sp_id == x[_SERVICE_PRINCIPAL_ID]]
-        if not matched:
-            raise CLIError("Could not retrieve credential from local cache for service principal {}. "
-                           "Please run 'az login' for this service principal."
-                           .format(sp_id))
-        matched_with_tenant = [x for x in matched if tenant == x[_SERVICE_PRINCIPAL_TENANT]]
-        if matched_with_tenant:
-            cred = matched_with_tenant[0]
-        else:
+        cred = self._sp_creds_index.get((sp_id, tenant))
+        if cred is None:
+            # fall back to any tenant's credential of the same service principal
+            matched = [x for x in self._service_principal_creds if sp_id == x[_SERVICE_PRINCIPAL_ID]]
+            if not matched:
+                raise CLIError("Could not retrieve credential from local cache for service principal {}. "
+                               "Please run 'az login' for this service principal."
+                               .format(sp_id))
             logger.warning("Could not retrieve credential from local cache for service principal %s under tenant %s. "
                            "Trying credential under tenant %s, assuming that is an app credential.",
                            sp_id, tenant, matched[0][_SERVICE_PRINCIPAL_TENANT])
@@ -1162,105 +1288,213 @@ class CredsCache:
             import adal
             all_entries = _load_tokens_from_file(self._token_file)
             self._load_service_principal_creds(all_entries)
-            real_token = [x for x in all_entries if x not in self._service_principal_creds]
+            # an entry is either a service principal credential or an AAD token, so a single pass
+            # on the marker field splits them without re-scanning the service principal list
+            real_token = [x for x in all_entries if not x.get(_SERVICE_PRINCIPAL_ID)]
             self._adal_token_cache_attr = adal.TokenCache(json.dumps(real_token))
         return self._adal_token_cache_attr
 
     def save_service_principal_cred(self, sp_entry):
         self.load_adal_token_cache()
-        matched = [x for x in self._service_principal_creds
-                   if sp_entry[_SERVICE_PRINCIPAL_ID] == x[_SERVICE_PRINCIPAL_ID] and
-                   sp_entry[_SERVICE_PRINCIPAL_TENANT] == x[_SERVICE_PRINCIPAL_TENANT]]
+        key = (sp_entry[_SERVICE_PRINCIPAL_ID], sp_entry[_SERVICE_PRINCIPAL_TENANT])
+        matched = self._sp_creds_index.get(key)
         state_changed = False
         if matched:
-            # pylint: disable=line-too-long
-            if (sp_entry.get(_ACCESS_TOKEN, None) != matched[0].get(_ACCESS_TOKEN, None) or
-                    sp_entry.get(_SERVICE_PRINCIPAL_CERT_FILE, None) != matched[0].get(_SERVICE_PRINCIPAL_CERT_FILE, None)):
-                self._service_principal_creds.remove(matched[0])
+            # Compare the whole entry so an unchanged credential skips the disk write, while a
+            # change in any persisted field (secret, certificate file or thumbprint) is saved.
+            if sp_entry != matched:
+                self._service_principal_creds.remove(matched)
                 self._service_principal_creds.append(sp_entry)
+                self._sp_creds_index[key] = sp_entry
                 state_changed = True
         else:
             self._service_principal_creds.append(sp_entry)
+            self._sp_creds_index[key] = sp_entry
             state_changed = True
 
         if state_changed:
+            if self._sp_sqlite_store is not None:
+                self._sp_sqlite_store.save_entry(sp_entry)
             self.persist_cached_creds()
 
     def _load_service_principal_creds(self, creds):
         for c in creds:
             if c.get(_SERVICE_PRINCIPAL_ID):
                 self._service_principal_creds.append(c)
+                # on duplicates, keep the first entry to preserve the old "first match wins" behavior
+                self._sp_creds_index.setdefault((c[_SERVICE_PRINCIPAL_ID], c.get(_SERVICE_PRINCIPAL_TENANT)), c)
+        if self._sp_sqlite_store is not None:
+            # one-shot migration: entries still living in the token file win and are copied over;
+            # the next flush rewrites the token file without them
+            for c in self._service_principal_creds:
+                self._sp_sqlite_store.save_entry(c)
+            for c in self._sp_sqlite_store.load_entries():
+                db_key = (c[_SERVICE_PRINCIPAL_ID], c.get(_SERVICE_PRINCIPAL_TENANT))
+                if db_key not in self._sp_creds_index:
+                    self._service_principal_creds.append(c)
+                    self._sp_creds_index[db_key] = c
         return self._service_principal_creds
 
     def remove_cached_creds(self, user_or_sp):
         state_changed = False
-        # clear AAD tokens
-        tokens = self.adal_token_cache.find({_TOKEN_ENTRY_USER_ID: user_or_sp})
+        # clear AAD tokens. Load the cache once and reuse it for both the query and the removal.
+        adal_token_cache = self.adal_token_cache
+        tokens = adal_token_cache.find({_TOKEN_ENTRY_USER_ID: user_or_sp})
         if tokens:
             state_changed = True
-            self.adal_token_cache.remove(tokens)
+            adal_token_cache.remove(tokens)
 
         # clear service principal creds
         matched = [x for x in self._service_principal_creds
                    if x[_SERVICE_PRINCIPAL_ID] == user_or_sp]
         if matched:
             state_changed = True
+            # filter on the id itself; 'x not in matched' would rescan matched for every entry
             self._service_principal_creds = [x for x in self._service_principal_creds
-                                             if x not in matched]
+                                             if x[_SERVICE_PRINCIPAL_ID] != user_or_sp]
+            for x in matched:
+                self._sp_creds_index.pop((x[_SERVICE_PRINCIPAL_ID], x.get(_SERVICE_PRINCIPAL_TENANT)), None)
+            if self._sp_sqlite_store is not None:
+                self._sp_sqlite_store.remove_entries(user_or_sp)
 
         if state_changed:
             self.persist_cached_creds()
 
     def remove_all_cached_creds(self):
+        if self._sp_sqlite_store is not None:
+            self._sp_sqlite_store.clear()
+            self._sp_sqlite_store_attr = None
         # we can clear file contents, but deleting it is simpler
         _delete_file(self._token_file)
+        # drop any pending flush so the deleted file is not resurrected at exit
+        self._should_flush_to_disk = False
+
+
+class SqliteCredStore:
+    """Service principal credential store backed by sqlite.
+
+    Opt-in alternative (set AZURE_CLI_SP_CREDS_SQLITE) to keeping service principal entries
+    inside accessTokens.json. The primary key on (sp_id, tenant) gives indexed lookups and
+    per-row updates instead of rewriting one JSON blob on every change. Unlike
+    accessTokens.json, the database is not shared with azure-xplat-cli.
+    """
+
+    def __init__(self, db_file):
+        import sqlite3
+        self._db_file = db_file
+        self._conn = sqlite3.connect(db_file)
+        os.chmod(db_file, 0o600)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS sp '
+                           '(sp_id TEXT, tenant TEXT, secret TEXT, cert_file TEXT, thumbprint TEXT, '
+                           'PRIMARY KEY(sp_id, tenant))')
+        self._conn.commit()
+
+    def load_entries(self):
+        """Return all rows in the same dict shape CredsCache persists."""
+        rows = self._conn.execute('SELECT sp_id, tenant, secret, cert_file, thumbprint FROM sp').fetchall()
+        entries = []
+        for sp_id, tenant, secret, cert_file, thumbprint in rows:
+            entry = {
+                _SERVICE_PRINCIPAL_ID: sp_id,
+                _SERVICE_PRINCIPAL_TENANT: tenant,
+            }
+            if secret is not None:
+                entry[_ACCESS_TOKEN] = secret
+            if cert_file is not None:
+                entry[_SERVICE_PRINCIPAL_CERT_FILE] = cert_file
+            if thumbprint is not None:
+                entry[_SERVICE_PRINCIPAL_CERT_THUMBPRINT] = thumbprint
+            entries.append(entry)
+        return entries
+
+    def save_entry(self, sp_entry):
+        self._conn.execute('INSERT OR REPLACE INTO sp (sp_id, tenant, secret, cert_file, thumbprint) '
+                           'VALUES (?, ?, ?, ?, ?)',
+                           (sp_entry[_SERVICE_PRINCIPAL_ID], sp_entry[_SERVICE_PRINCIPAL_TENANT],
+                            sp_entry.get(_ACCESS_TOKEN), sp_entry.get(_SERVICE_PRINCIPAL_CERT_FILE),
+                            sp_entry.get(_SERVICE_PRINCIPAL_CERT_THUMBPRINT)))
+        self._conn.commit()
+
+    def remove_entries(self, sp_id):
+        self._conn.execute('DELETE FROM sp WHERE sp_id = ?', (sp_id,))
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.close()
+        _delete_file(self._db_file)
+
+
+# low-tech but safe parsing based on
+# https://github.com/libressl-portable/openbsd/blob/master/src/lib/libcrypto/pem/pem.h
+# compiled once instead of per login
+_PEM_PUBLIC_CERT_RE = re.compile(r'\-+BEGIN CERTIFICATE.+\-+(?P<public>[^-]+)\-+END CERTIFICATE.+\-+', re.I)
+
+
+# parsed certificate files keyed by (absolute path, sn_issuer flag); values are
+# (mtime, cert_file_string, thumbprint, public_certificate). Scripts that build credentials
+# repeatedly keep re-reading the same PEM, so reuse the parse while the file is unchanged.
+_CERT_CACHE = {}
+
+
+def _get_pem_certificate_thumbprint(cert_string):
+    """Return the SHA1 thumbprint of a PEM certificate in the AB:CD:... form ADAL expects."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes
+    cert = x509.load_pem_x509_certificate(cert_string.encode())
+    return ':'.join('{:02X}'.format(b) for b in cert.fingerprint(hashes.SHA1()))
 
 
 class ServicePrincipalAuth:
 
+    # a session can hold one instance per service principal entry; slots keep them small
+    __slots__ = ('secret', 'certificate_file', 'cert_file_string', 'thumbprint', 'public_certificate')
+
     def __init__(self, password_arg_value, use_cert_sn_issuer=None):
         if not password_arg_value:
             raise CLIError('missing secret or certificate in order to '
                            'authenticate through a service principal')
+        self.secret = None
+        self.certificate_file = None
+        self.cert_file_string = None
+        self.thumbprint = None
+        self.public_certificate = None
         if os.path.isfile(password_arg_value):
             certificate_file = password_arg_value
-            from OpenSSL.crypto import load_certificate, FILETYPE_PEM, Error
             self.certificate_file = certificate_file
-            self.public_certificate = None
+            cache_key = (os.path.abspath(certificate_file), bool(use_cert_sn_issuer))
+            mtime = os.path.getmtime(certificate_file)
+            cached = _CERT_CACHE.get(cache_key)
+            if cached and cached[0] == mtime:
+                _, self.cert_file_string, self.thumbprint, self.public_certificate = cached
+                return
             try:
                 with open(certificate_file, 'r') as file_reader:
                     self.cert_file_string = file_reader.read()
-                    cert = load_certificate(FILETYPE_PEM, self.cert_file_string)
-                    self.thumbprint = cert.digest("sha1").decode()
-                    if use_cert_sn_issuer:
-                        # low-tech but safe parsing based on
-                        # https://github.com/libressl-portable/openbsd/blob/master/src/lib/libcrypto/pem/pem.h
-                        match = re.search(r'\-+BEGIN CERTIFICATE.+\-+(?P<public>[^-]+)\-+END CERTIFICATE.+\-+',
-                                          self.cert_file_string, re.I)
-                        self.public_certificate = match.group('public').strip()
-            except (UnicodeDecodeError, Error):
+                self.thumbprint = _get_pem_certificate_thumbprint(self.cert_file_string)
+                if use_cert_sn_issuer:
+                    match = _PEM_PUBLIC_CERT_RE.search(self.cert_file_string)
+                    self.public_certificate = match.group('public').strip()
+            except (UnicodeDecodeError, ValueError):
                 raise CLIError('Invalid certificate, please use a valid PEM file.')
+            _CERT_CACHE[cache_key] = (mtime, self.cert_file_string, self.thumbprint, self.public_certificate)
         else:
             self.secret = password_arg_value
 
     def acquire_token(self, authentication_context, resource, client_id):
-        if hasattr(self, 'secret'):
+        if self.secret is not None:
             return authentication_context.acquire_token_with_client_credentials(resource, client_id, self.secret)
         return authentication_context.acquire_token_with_client_certificate(resource, client_id, self.cert_file_string,
                                                                             self.thumbprint, self.public_certificate)
 
     def get_entry_to_persist(self, sp_id, tenant):
-        entry = {
+        return {
             _SERVICE_PRINCIPAL_ID: sp_id,
             _SERVICE_PRINCIPAL_TENANT: tenant,
+            **({_ACCESS_TOKEN: self.secret} if self.secret is not None else
+               {_SERVICE_PRINCIPAL_CERT_FILE: self.certificate_file,
+                _SERVICE_PRINCIPAL_CERT_THUMBPRINT: self.thumbprint}),
         }
-        if hasattr(self, 'secret'):
-            entry[_ACCESS_TOKEN] = self.secret
-        else:
-            entry[_SERVICE_PRINCIPAL_CERT_FILE] = self.certificate_file
-            entry[_SERVICE_PRINCIPAL_CERT_THUMBPRINT] = self.thumbprint
-
-        return entry
 
 
 def _get_authorization_code_worker(authority_url, resource, results):
@@ -1293,10 +1527,8 @@ def _get_authorization_code_worker(authority_url, resource, results):
             self.send_header('Content-type', 'text/html')
             self.end_headers()
 
-            landing_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'auth_landing_pages',
-                                        'ok.html' if 'code' in query else 'fail.html')
-            with open(landing_file, 'rb') as html_file:
-                self.wfile.write(html_file.read())
+            landing_file = _AUTH_OK_PAGE if 'code' in query else _AUTH_FAIL_PAGE
+            self.wfile.write(_read_landing_page(landing_file))
 
         def log_message(self, format, *args):  # pylint: disable=redefined-builtin,unused-argument,no-self-use
             pass  # this prevent http server from dumping messages to stdout
@@ -1381,8 +1613,6 @@ def _get_authorization_code_worker(authority_url, resource, results):
 
 
 def _get_authorization_code(resource, authority_url):
-    import threading
-    import time
     results = {}
     t = threading.Thread(target=_get_authorization_code_worker,
                          args=(authority_url, resource, results))
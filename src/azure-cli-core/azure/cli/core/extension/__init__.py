@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 # pylint: disable=line-too-long
 
+import logging
 import os
 import traceback
 import json
@@ -78,7 +79,8 @@ class Extension:
         try:
             self._version = self._version or self.get_version()
         except Exception:  # pylint: disable=broad-except
-            logger.debug("Unable to get extension version: %s", traceback.format_exc())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Unable to get extension version: %s", traceback.format_exc())
         return self._version
 
     @property
@@ -90,7 +92,8 @@ class Extension:
         try:
             self._metadata = self._metadata or self.get_metadata()
         except Exception:  # pylint: disable=broad-except
-            logger.debug("Unable to get extension metadata: %s", traceback.format_exc())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Unable to get extension metadata: %s", traceback.format_exc())
         return self._metadata
 
     @property
@@ -103,7 +106,8 @@ class Extension:
             if not isinstance(self._preview, bool):
                 self._preview = bool(self.metadata.get(EXT_METADATA_ISPREVIEW))
         except Exception:  # pylint: disable=broad-except
-            logger.debug("Unable to get extension preview status: %s", traceback.format_exc())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Unable to get extension preview status: %s", traceback.format_exc())
         return self._preview
 
     @property
@@ -116,7 +120,8 @@ class Extension:
             if not isinstance(self._experimental, bool):
                 self._experimental = bool(self.metadata.get(EXT_METADATA_ISEXPERIMENTAL))
         except Exception:  # pylint: disable=broad-except
-            logger.debug("Unable to get extension experimental status: %s", traceback.format_exc())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Unable to get extension experimental status: %s", traceback.format_exc())
         return self._experimental
 
     def get_version(self):
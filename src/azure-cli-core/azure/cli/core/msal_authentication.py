@@ -35,9 +35,10 @@ class ServicePrincipalCredential(ConfidentialClientApplication):
                 cert_str = f.read()
 
             # Compute the thumbprint
-            from OpenSSL.crypto import load_certificate, FILETYPE_PEM
-            cert = load_certificate(FILETYPE_PEM, cert_str)
-            thumbprint = cert.digest("sha1").decode().replace(' ', '').replace(':', '')
+            from cryptography import x509
+            from cryptography.hazmat.primitives import hashes
+            cert = x509.load_pem_x509_certificate(cert_str.encode())
+            thumbprint = cert.fingerprint(hashes.SHA1()).hex().upper()
 
             client_credential = {"private_key": cert_str, "thumbprint": thumbprint}
         else:
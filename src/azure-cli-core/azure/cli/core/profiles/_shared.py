@@ -4,6 +4,8 @@
 # --------------------------------------------------------------------------------------------
 
 # TODO Move this to a package shared by CLI and SDK
+import logging
+
 from enum import Enum
 from functools import total_ordering
 from importlib import import_module
@@ -579,8 +581,9 @@ def _get_attr(sdk_path, mod_attr_path, checked=True):
                 op = getattr(op, part)
         return op
     except (ImportError, AttributeError) as ex:
-        import traceback
-        logger.debug(traceback.format_exc())
+        if logger.isEnabledFor(logging.DEBUG):
+            import traceback
+            logger.debug(traceback.format_exc())
         if checked:
             return None
         raise ex
@@ -16,7 +16,8 @@ from copy import deepcopy
 from adal import AdalError
 
 from azure.cli.core._profile import (Profile, CredsCache, SubscriptionFinder,
-                                     ServicePrincipalAuth, _AUTH_CTX_FACTORY, _USE_VENDORED_SUBSCRIPTION_SDK,
+                                     ServicePrincipalAuth, SqliteCredStore,
+                                     _AUTH_CTX_FACTORY, _USE_VENDORED_SUBSCRIPTION_SDK,
                                      _transform_subscription_for_multiapi)
 if _USE_VENDORED_SUBSCRIPTION_SDK:
     from azure.cli.core.vendored_sdks.subscriptions.models import \
@@ -1620,10 +1621,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache.retrieve_cred_for_service_principal('myapp'), 'Secret')
         self.assertEqual(creds_cache.retrieve_cred_for_service_principal('myapp2'), 'junkcert.pem')
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1648,10 +1650,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache._service_principal_creds, [test_sp, test_sp2])
         mock_open_for_write.assert_called_with(mock.ANY, 'w+')
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_add_preexisting_sp_creds(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1669,10 +1672,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache._service_principal_creds, [test_sp])
         self.assertFalse(mock_open_for_write.called)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1692,10 +1696,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache._service_principal_creds, [new_creds])
         self.assertTrue(mock_open_for_write.called)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_match_service_principal_correctly(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_match_service_principal_correctly(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1719,10 +1724,11 @@ class TestProfile(unittest.TestCase):
         self.assertRaises(ValueError, creds_cache.retrieve_token_for_service_principal,
                           'myapp', 'resource1', 'mytenant2', False)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1749,11 +1755,12 @@ class TestProfile(unittest.TestCase):
         mock_open_for_write.assert_called_with(mock.ANY, 'w+')
         self.assertEqual(mock_open_for_write.call_count, 2)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
     @mock.patch('adal.AuthenticationContext', autospec=True)
-    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file):  # pylint: disable=line-too-long
+    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file, mock_replace):  # pylint: disable=line-too-long
         cli = DummyCli()
         token_entry2 = {
             "accessToken": "new token",
@@ -1788,10 +1795,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(token, 'new token')
         self.assertEqual(token_type, token_entry2['tokenType'])
 
-    @mock.patch('azure.cli.core._profile.get_file_json', autospec=True)
+    @mock.patch('azure.cli.core._profile._read_token_file_entries', autospec=True)
+    @mock.patch('os.path.getmtime', autospec=True, return_value=0)
     @mock.patch('os.path.isfile', autospec=True, return_value=True)
-    def test_credscache_good_error_on_file_corruption(self, isfile_mock, get_file_json_mock):
-        get_file_json_mock.side_effect = ValueError('a bad error for you')
+    def test_credscache_good_error_on_file_corruption(self, isfile_mock, getmtime_mock, read_entries_mock):
+        read_entries_mock.side_effect = ValueError('a bad error for you')
         cli = DummyCli()
 
         # action
@@ -1803,6 +1811,35 @@ class TestProfile(unittest.TestCase):
 
         self.assertTrue(re.findall(r'bad error for you', str(context.exception)))
 
+    def test_sqlite_cred_store_roundtrip(self):
+        import tempfile
+        test_sp = {
+            "servicePrincipalId": "myapp",
+            "servicePrincipalTenant": "mytenant",
+            "accessToken": "Secret"
+        }
+        test_sp2 = {
+            "servicePrincipalId": "myapp2",
+            "servicePrincipalTenant": "mytenant2",
+            "certificateFile": "junkcert.pem",
+            "thumbprint": "junkthumbprint"
+        }
+        store = SqliteCredStore(os.path.join(tempfile.mkdtemp(), 'sp.db'))
+
+        # action & assert
+        store.save_entry(test_sp)
+        store.save_entry(test_sp2)
+        self.assertEqual(sorted(store.load_entries(), key=lambda e: e['servicePrincipalId']),
+                         [test_sp, test_sp2])
+
+        # saving again with the same key updates in place
+        updated_sp = dict(test_sp, accessToken='Secret2')
+        store.save_entry(updated_sp)
+        store.remove_entries('myapp2')
+        self.assertEqual(store.load_entries(), [updated_sp])
+
+        store.clear()
+
     def test_service_principal_auth_client_secret(self):
         sp_auth = ServicePrincipalAuth('verySecret!')
         result = sp_auth.get_entry_to_persist('sp_id1', 'tenant1')
@@ -1473,10 +1473,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache.retrieve_cred_for_service_principal('myapp'), 'Secret')
         self.assertEqual(creds_cache.retrieve_cred_for_service_principal('myapp2'), 'junkcert.pem')
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1501,10 +1502,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache._service_principal_creds, [test_sp, test_sp2])
         mock_open_for_write.assert_called_with(mock.ANY, 'w+')
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_add_preexisting_sp_creds(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1522,10 +1524,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache._service_principal_creds, [test_sp])
         self.assertFalse(mock_open_for_write.called)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1545,10 +1548,11 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache._service_principal_creds, [new_creds])
         self.assertTrue(mock_open_for_write.called)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_match_service_principal_correctly(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_match_service_principal_correctly(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1565,10 +1569,11 @@ class TestProfile(unittest.TestCase):
         # we know the matching did go through)
         self.assertRaises(ValueError, creds_cache.retrieve_token_for_service_principal, 'myapp', 'resource1', 'mytenant', False)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
-    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file):
+    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file, mock_replace):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1595,11 +1600,12 @@ class TestProfile(unittest.TestCase):
         mock_open_for_write.assert_called_with(mock.ANY, 'w+')
         self.assertEqual(mock_open_for_write.call_count, 2)
 
+    @mock.patch('os.replace', autospec=True)
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
     @mock.patch('os.fdopen', autospec=True)
     @mock.patch('os.open', autospec=True)
     @mock.patch('adal.AuthenticationContext', autospec=True)
-    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file):  # pylint: disable=line-too-long
+    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file, mock_replace):  # pylint: disable=line-too-long
         cli = DummyCli()
         token_entry2 = {
             "accessToken": "new token",
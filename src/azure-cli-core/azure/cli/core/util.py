@@ -65,7 +65,8 @@ def handle_exception(ex):  # pylint: disable=too-many-locals, too-many-statement
 
     logger.debug("azure.cli.core.util.handle_exception is called with an exception:")
     # Print the traceback and exception message
-    logger.debug(traceback.format_exc())
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(traceback.format_exc())
 
     error_msg = getattr(ex, 'message', str(ex))
     exit_code = 1